@@ -1,22 +1,32 @@
 import pandas as pd
 import csv, re
+from stage_profiler import StageProfiler   # PROFILE=1 to time each stage
 
 infile  = r"C:\Users\grobl\OneDrive\Python\OpenAI\Nutrient.xlsx"
 outfile = r"C:\Users\grobl\OneDrive\Python\OpenAI\Nutrient.csv"
 
+prof = StageProfiler("Nutrient_xlsx2csv")
+
 # Read first sheet; dtype=str preserves things like leading zeros
-df = pd.read_excel(infile, sheet_name=0, dtype=str)
+with prof.stage("read_excel") as st:
+    df = pd.read_excel(infile, sheet_name=0, dtype=str)
+    st.rows = len(df)
 
 # Clean headers: remove embedded newlines/tabs and trim
-clean_cols = []
-for c in df.columns:
-    s = str(c) if c is not None else ""
-    s = re.sub(r'[\r\n\t]+', ' ', s).strip()
-    clean_cols.append(s)
-df.columns = clean_cols
+with prof.stage("clean_headers", rows=len(df.columns)):
+    clean_cols = []
+    for c in df.columns:
+        s = str(c) if c is not None else ""
+        s = re.sub(r'[\r\n\t]+', ' ', s).strip()
+        clean_cols.append(s)
+    df.columns = clean_cols
 
 # (Optional) also strip newlines inside data cells:
-df = df.map(lambda x: re.sub(r'[\r\n\t]+', ' ', str(x)) if x is not None else x)
+with prof.stage("clean_cells", rows=len(df)):
+    df = df.map(lambda x: re.sub(r'[\r\n\t]+', ' ', str(x)) if x is not None else x)
 
 # Write CSV with UTF-8 and quote ALL fields (safest when commas exist in headers)
-df.to_csv(outfile, index=False, encoding="utf-8", quoting=csv.QUOTE_ALL)
+with prof.stage("to_csv", rows=len(df)):
+    df.to_csv(outfile, index=False, encoding="utf-8", quoting=csv.QUOTE_ALL)
+
+prof.finish()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ASX trading calendar (weekends + exchange holidays)
+
+Version: Precomputed session index held as integer ordinal arrays.
+
+Features:
+1) Every calendar day in the covered range maps to a session ordinal
+   (0, 1, 2, ...) or -1 for weekends/holidays, so date -> session is O(1).
+2) Hard-coded ASX holiday table, extensible offline via asx_holidays.json
+   (a plain JSON list of "YYYY-MM-DD" strings next to this script).
+3) Vectorized gap detection per ticker against the calendar.
+4) Fast parsing of bulk date columns (each format is tried once per column,
+   not once per cell).
+5) Missing sessions collapse into contiguous (start, end) ranges that can be
+   handed straight to yf.download.
+
+Years with no entries in the holiday table are treated as weekdays-only.
+Any lookup that touches such a year prints a warning (once per year), since
+its holidays would otherwise show up as missing sessions and shift session
+counts.
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# ---- Dependencies ----
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    print("Missing dependencies. Please run:\n  pip install pandas numpy")
+    sys.exit(1)
+
+# ---- Settings ----
+CALENDAR_START = "2000-01-01"
+CALENDAR_END = "2035-12-31"
+HOLIDAYS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asx_holidays.json")
+
+DATE_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%Y/%m/%d"]
+
+# 🔧 ASX full-day closures (add more here or in asx_holidays.json)
+ASX_HOLIDAYS: List[str] = [
+    # 2023
+    "2023-01-02", "2023-01-26", "2023-04-07", "2023-04-10", "2023-04-25",
+    "2023-06-12", "2023-12-25", "2023-12-26",
+    # 2024
+    "2024-01-01", "2024-01-26", "2024-03-29", "2024-04-01", "2024-04-25",
+    "2024-06-10", "2024-12-25", "2024-12-26",
+    # 2025
+    "2025-01-01", "2025-01-27", "2025-04-18", "2025-04-21", "2025-04-25",
+    "2025-06-09", "2025-12-25", "2025-12-26",
+    # 2026
+    "2026-01-01", "2026-01-26", "2026-04-03", "2026-04-06", "2026-06-08",
+    "2026-12-25", "2026-12-28",
+]
+
+
+# ---------- Date parsing ----------
+
+@lru_cache(maxsize=4096)
+def parse_date_any(s: str) -> Optional[datetime]:
+    """Parse AU-friendly and ISO date formats (cached per input string)."""
+    s = s.strip()
+    if not s:
+        return None
+    for f in DATE_FORMATS:
+        try:
+            return datetime.strptime(s, f)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_date_column(values: Iterable) -> pd.Series:
+    """
+    Parse a bulk date column to datetime64 (midnight, tz-naive).
+    ISO is tried on the whole column first; the remaining formats only
+    see the cells that are still unparsed. Bad cells become NaT.
+    """
+    s = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(s):
+        if getattr(s.dt, "tz", None) is not None:
+            s = s.dt.tz_localize(None)
+        return s.dt.normalize()
+
+    s = s.astype("string").str.strip()
+    out = pd.to_datetime(s.str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    for f in DATE_FORMATS:
+        todo = out.isna() & s.notna() & (s != "")
+        if not todo.any():
+            break
+        out[todo] = pd.to_datetime(s[todo], format=f, errors="coerce")
+    return out
+
+
+def _to_day64(values) -> np.ndarray:
+    """Coerce dates/strings/Timestamps (scalar or array) to datetime64[D]."""
+    if isinstance(values, str):
+        dt = parse_date_any(values)
+        return np.datetime64(dt.date() if dt else "NaT", "D")
+    if isinstance(values, (datetime, date, np.datetime64, pd.Timestamp)):
+        return np.datetime64(pd.Timestamp(values).date(), "D")
+    parsed = parse_date_column(values)
+    return parsed.to_numpy(dtype="datetime64[D]")
+
+
+def _scalar_day64(d) -> np.datetime64:
+    day = _to_day64(d)
+    if np.ndim(day) != 0 or np.isnat(day):
+        raise ValueError(f"Invalid date: {d!r}")
+    return day
+
+
+def _day_dt(d) -> datetime:
+    return pd.Timestamp(_scalar_day64(d)).to_pydatetime()
+
+
+# ---------- Calendar ----------
+
+def load_holidays(path: str = HOLIDAYS_JSON) -> List[str]:
+    """Built-in holiday table plus any extra dates from asx_holidays.json."""
+    holidays = list(ASX_HOLIDAYS)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as fh:
+            holidays.extend(str(d) for d in json.load(fh))
+    return sorted(set(holidays))
+
+
+class TradingCalendar:
+    """
+    ASX session index over [start, end].
+
+    sessions: datetime64[D] array of trading days, in order.
+    ordinals: int32 array, one slot per calendar day since `start`,
+              holding the session ordinal or -1 for non-trading days.
+    """
+
+    def __init__(self, start: str = CALENDAR_START, end: str = CALENDAR_END,
+                 holidays: Optional[List[str]] = None):
+        self.start = np.datetime64(start, "D")
+        self.end = np.datetime64(end, "D")
+        self.holidays = np.array(load_holidays() if holidays is None else holidays,
+                                 dtype="datetime64[D]")
+
+        self.covered_years = {int(str(h)[:4]) for h in self.holidays}
+        self._warned_years = set()
+
+        days = np.arange(self.start, self.end + 1, dtype="datetime64[D]")
+        is_session = np.is_busday(days, holidays=self.holidays)
+        self.sessions = days[is_session]
+        self.ordinals = np.where(is_session, np.cumsum(is_session) - 1, -1).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    # ---- Holiday coverage ----
+
+    def uncovered_years(self, start, end) -> List[int]:
+        """Years in [start, end] with no entries in the holiday table."""
+        y0 = int(str(_scalar_day64(start))[:4])
+        y1 = int(str(_scalar_day64(end))[:4])
+        return [y for y in range(y0, y1 + 1) if y not in self.covered_years]
+
+    def warn_uncovered(self, start, end):
+        """Print a one-time warning for years the holiday table does not cover."""
+        years = [y for y in self.uncovered_years(start, end) if y not in self._warned_years]
+        if years:
+            self._warned_years.update(years)
+            print(f"Warning: no ASX holiday table for {', '.join(map(str, years))}; "
+                  f"holidays there count as trading days (missing sessions). "
+                  f"Add them to ASX_HOLIDAYS or {os.path.basename(HOLIDAYS_JSON)}.")
+
+    # ---- Lookups ----
+
+    def _offsets(self, days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        off = (days - self.start).astype("int64")
+        bad = np.isnat(days) | (off < 0) | (off >= len(self.ordinals))
+        return np.where(bad, -1, off), bad
+
+    def session_ordinal(self, values) -> np.ndarray:
+        """Session ordinal(s) for date(s); -1 for non-trading or out-of-range days."""
+        days = _to_day64(values)
+        off, bad = self._offsets(np.atleast_1d(days))
+        out = np.where(bad, -1, self.ordinals[np.where(bad, 0, off)])
+        return out[0] if np.ndim(days) == 0 else out
+
+    def is_session(self, values) -> np.ndarray:
+        return self.session_ordinal(values) >= 0
+
+    def session_floor(self, d) -> int:
+        """Ordinal of the last session on or before d."""
+        return int(np.searchsorted(self.sessions, _scalar_day64(d), side="right")) - 1
+
+    def session_ceil(self, d) -> int:
+        """Ordinal of the first session on or after d."""
+        return int(np.searchsorted(self.sessions, _scalar_day64(d), side="left"))
+
+    def shift_sessions(self, d, n: int) -> datetime:
+        """Date n sessions after (or before, if n < 0) the session on/before d."""
+        i = min(max(self.session_floor(d) + n, 0), len(self.sessions) - 1)
+        out = pd.Timestamp(self.sessions[i]).to_pydatetime()
+        self.warn_uncovered(min(out, _day_dt(d)), max(out, _day_dt(d)))
+        return out
+
+    def sessions_between(self, start, end) -> np.ndarray:
+        """Trading days in [start, end] inclusive."""
+        return self.sessions[self.session_ceil(start):self.session_floor(end) + 1]
+
+    # ---- Validation ----
+
+    def missing_sessions(self, df: pd.DataFrame, start, end,
+                         tickers: Optional[List[str]] = None,
+                         value_col: Optional[str] = None) -> pd.DataFrame:
+        """
+        Sessions in [start, end] with no bar, per ticker.
+        Tickers with no rows at all are reported missing every session.
+        With value_col, a row only counts as a bar when that column holds a
+        number (yfinance pads every ticker to the union date index with
+        empty prices; formatted "" prices count as empty too).
+        Returns a long table: Ticker, Date.
+        """
+        self.warn_uncovered(start, end)
+        lo, hi = self.session_ceil(start), self.session_floor(end)
+        n = max(hi - lo + 1, 0)
+        if tickers is None:
+            tickers = sorted(df["Ticker"].dropna().unique()) if not df.empty else []
+
+        ords = self.session_ordinal(df["Date"]) if not df.empty else np.array([], dtype=np.int32)
+        tick = df["Ticker"].to_numpy() if not df.empty else np.array([], dtype=object)
+        keep = (ords >= lo) & (ords <= hi)
+        if value_col is not None and not df.empty:
+            keep &= pd.to_numeric(df[value_col], errors="coerce").notna().to_numpy()
+
+        frames = []
+        for t in tickers:
+            present = np.zeros(n, dtype=bool)
+            present[ords[keep & (tick == t)] - lo] = True
+            gaps = self.sessions[lo:hi + 1][~present]
+            if len(gaps):
+                frames.append(pd.DataFrame({"Ticker": t, "Date": pd.to_datetime(gaps)}))
+
+        if not frames:
+            return pd.DataFrame({"Ticker": pd.Series(dtype=object),
+                                 "Date": pd.Series(dtype="datetime64[ns]")})
+        return pd.concat(frames, ignore_index=True)
+
+    def off_calendar_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows dated on a weekend/holiday (or outside the calendar range)."""
+        if df.empty:
+            return df
+        return df[self.session_ordinal(df["Date"]) < 0]
+
+    def missing_ranges(self, missing: pd.DataFrame) -> List[Tuple[str, datetime, datetime]]:
+        """
+        Collapse missing sessions into contiguous runs:
+        [(Ticker, first_missing, last_missing), ...].
+        Runs are contiguous in sessions, so a gap spanning a weekend is one range.
+        """
+        out = []
+        for t, grp in missing.groupby("Ticker", sort=True):
+            ords = np.sort(self.session_ordinal(grp["Date"]))
+            breaks = np.flatnonzero(np.diff(ords) != 1) + 1
+            for run in np.split(ords, breaks):
+                out.append((t,
+                            pd.Timestamp(self.sessions[run[0]]).to_pydatetime(),
+                            pd.Timestamp(self.sessions[run[-1]]).to_pydatetime()))
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_calendar() -> TradingCalendar:
+    """Shared default calendar (built once per process)."""
+    return TradingCalendar()
+
+
+def yf_range(start: datetime, end: datetime) -> Tuple[str, str]:
+    """yf.download start/end strings for an inclusive [start, end] date range."""
+    return start.strftime("%Y-%m-%d"), (end + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+# ---------- Main ----------
+
+def main():
+    """Check a CSV (Date, Ticker columns) against the calendar and list gaps."""
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("asx_eod_output", "DailyData.csv")
+    if not os.path.exists(path):
+        print(f"File not found: {path}")
+        sys.exit(2)
+
+    cal = get_calendar()
+    df = pd.read_csv(path, dtype={"Date": str})
+    df["Date"] = parse_date_column(df["Date"])
+    df = df.dropna(subset=["Date"])
+    if df.empty:
+        print("No dated rows found.")
+        sys.exit(5)
+
+    start, end = df["Date"].min(), df["Date"].max()
+    print(f"\nChecking {path}: {start.date()} to {end.date()} "
+          f"({len(cal.sessions_between(start, end))} sessions)")
+
+    off = cal.off_calendar_rows(df)
+    if not off.empty:
+        print(f"\nRows on non-trading days: {len(off)}")
+        print(off[["Date", "Ticker"]].to_string(index=False))
+
+    missing = cal.missing_sessions(df, start, end,
+                                   value_col="Close" if "Close" in df.columns else None)
+    if missing.empty:
+        print("\nNo missing sessions.")
+    else:
+        print("\nMissing sessions:")
+        for t, a, b in cal.missing_ranges(missing):
+            print(f"  - {t}: {a.date()} .. {b.date()}")
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    main()
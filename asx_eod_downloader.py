@@ -12,12 +12,14 @@ Features:
 3) Price data rounded to 3 dp and padded with trailing zeros.
 4) No command-line arguments.
 5) Hard-coded list of ASX tickers below.
+6) Date parsing and default range come from the ASX trading calendar
+   (asx_calendar.py).
 """
 
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import datetime
+from typing import List
 
 # ---- Dependencies ----
 # pip install yfinance pandas
@@ -28,12 +30,15 @@ except ImportError:
     print("Missing dependencies. Please run:\n  pip install yfinance pandas")
     sys.exit(1)
 
+from asx_calendar import get_calendar, parse_date_any, yf_range
+
 # Disable caching quirks on OneDrive
 os.environ["YF_NO_CACHE"] = "1"
 
 # ---- User settings ----
 OUTPUT_DIR = "asx_eod_output"
 OUTPUT_CSV = "DailyData.csv"
+DEFAULT_LOOKBACK_SESSIONS = 42   # ~60 calendar days
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
 # 🔧 EDIT YOUR DEFAULT TICKERS HERE:
@@ -55,20 +60,6 @@ TICKERS = ["ALK.AX",
 
 # ---------- Utilities ----------
 
-def parse_date_any(s: str) -> Optional[datetime]:
-    """Parse AU-friendly and ISO date formats."""
-    s = s.strip()
-    if not s:
-        return None
-    fmts = ["%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%Y/%m/%d"]
-    for f in fmts:
-        try:
-            return datetime.strptime(s, f)
-        except ValueError:
-            pass
-    return None
-
-
 def prompt_with_default(prompt: str, default: str) -> str:
     s = input(f"{prompt} [{default}]: ").strip()
     return s or default
@@ -105,8 +96,9 @@ def prompt_dates() -> (datetime, datetime):
     print("\n=== ASX EOD Downloader ===")
     print(f"Using hard-coded tickers: {', '.join(TICKERS)}")
 
-    default_start = (datetime.today() - timedelta(days=60)).strftime("%Y-%m-%d")
-    default_end   = datetime.today().strftime("%Y-%m-%d")
+    today = datetime.today()
+    default_start = get_calendar().shift_sessions(today, -DEFAULT_LOOKBACK_SESSIONS).strftime("%Y-%m-%d")
+    default_end   = today.strftime("%Y-%m-%d")
 
     start_s = prompt_with_default("Start date", default_start)
     end_s   = prompt_with_default("End date", default_end)
@@ -128,7 +120,7 @@ def prompt_dates() -> (datetime, datetime):
 def main():
     tickers = TICKERS
     start_dt, end_dt = prompt_dates()
-    end_plus_one = end_dt + timedelta(days=1)
+    yf_start, yf_end = yf_range(start_dt, end_dt)
 
     print(f"\nDownloading EOD for {', '.join(tickers)} "
           f"from {start_dt.date()} to {end_dt.date()} ...")
@@ -136,8 +128,8 @@ def main():
     try:
         raw = yf.download(
             tickers,
-            start=start_dt.strftime("%Y-%m-%d"),
-            end=end_plus_one.strftime("%Y-%m-%d"),
+            start=yf_start,
+            end=yf_end,
             interval="1d",
             group_by="ticker",
             auto_adjust=False,
@@ -15,12 +15,15 @@ Features:
 4) Value rounded to 2 dp (zero-padded, e.g. 5145.60).
 5) No command-line arguments; only prompts for date range.
 6) Hard-coded [Ticker, Shares] pairs in a 2D array.
+7) Dates checked against the ASX trading calendar (asx_calendar.py);
+   missing sessions per ticker are listed after the summary.
+8) Set PROFILE=1 (or PROFILE=cprofile) to time each stage; see stage_profiler.py.
 """
 
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import List, Tuple
 
 # ---- Dependencies ----
 try:
@@ -30,11 +33,15 @@ except ImportError:
     print("Missing dependencies. Please run:\n  pip install yfinance pandas")
     sys.exit(1)
 
+from asx_calendar import get_calendar, parse_date_any, yf_range
+from stage_profiler import StageProfiler
+
 os.environ["YF_NO_CACHE"] = "1"
 
 # ---- User settings ----
 OUTPUT_DIR = "asx_eod_output"
 OUTPUT_CSV = "DailyData.csv"
+DEFAULT_LOOKBACK_SESSIONS = 42   # ~60 calendar days
 
 # 🔧 EDIT YOUR HOLDINGS HERE (2D array: [ [Ticker, Shares], ... ])
 TICKERS_AND_SHARES: List[Tuple[str, int]] = [
@@ -58,19 +65,6 @@ SHARES_MAP = {sym: int(sh) for sym, sh in TICKERS_AND_SHARES}
 
 # ---------- Utilities ----------
 
-def parse_date_any(s: str) -> Optional[datetime]:
-    s = s.strip()
-    if not s:
-        return None
-    fmts = ["%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%Y/%m/%d"]
-    for f in fmts:
-        try:
-            return datetime.strptime(s, f)
-        except ValueError:
-            pass
-    return None
-
-
 def prompt_with_default(prompt: str, default: str) -> str:
     s = input(f"{prompt} [{default}]: ").strip()
     return s or default
@@ -91,7 +85,8 @@ def normalize_yf_panel(df: pd.DataFrame, tickers: List[str]) -> pd.DataFrame:
             if k not in sub.columns:
                 sub[k] = pd.NA
         sub = sub[["Open", "High", "Low", "Close", "Volume"]]
-        sub = sub.reset_index().rename(columns={"index": "Date"})
+        sub = sub.reset_index()
+        sub = sub.rename(columns={sub.columns[0]: "Date"})   # "Date" (1d) or "Datetime" (intraday)
         sub.insert(0, "Ticker", t)
         records.append(sub)
 
@@ -103,14 +98,43 @@ def normalize_yf_panel(df: pd.DataFrame, tickers: List[str]) -> pd.DataFrame:
     return out
 
 
+def format_eod(df: pd.DataFrame) -> pd.DataFrame:
+    """Long-form OHLCV -> DailyData schema (Shares, Value, padded prices, column order)."""
+    # ---- Attach Shares ----
+    df["Shares"] = df["Ticker"].map(SHARES_MAP).astype("Int64")
+
+    # ---- Compute Value = Shares × Close ----
+    close_numeric = pd.to_numeric(df["Close"], errors="coerce")
+    df["Value"] = (df["Shares"].astype("float64") * close_numeric).round(2)
+    # Convert to string with 2dp and zero padding
+    df["Value"] = df["Value"].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "")
+
+    # ---- Round and format price data (3 dp padded) ----
+    price_cols = ["Open", "High", "Low", "Close"]
+    for c in price_cols:
+        df[c] = pd.to_numeric(df[c], errors="coerce").round(3)
+        df[c] = df[c].apply(lambda x: f"{x:.3f}" if pd.notna(x) else "")
+
+    # ---- Ensure Volume is numeric ----
+    df["Volume"] = pd.to_numeric(df["Volume"], errors="coerce").astype("Int64")
+
+    # ---- Reorder columns ----
+    base_order = ["Date", "Ticker", "Shares", "Open", "High", "Low", "Close", "Volume", "Value"]
+    existing = [c for c in base_order if c in df.columns]
+    extras = [c for c in df.columns if c not in existing]
+    df = df[existing + extras].sort_values(["Date", "Ticker"]).reset_index(drop=True)
+    return df
+
+
 def prompt_dates() -> (datetime, datetime):
     print("\n=== ASX EOD Downloader ===")
     print("Using hard-coded holdings:")
     for sym, sh in TICKERS_AND_SHARES:
         print(f"  - {sym}: {sh} shares")
 
-    default_start = (datetime.today() - timedelta(days=60)).strftime("%Y-%m-%d")
-    default_end   = datetime.today().strftime("%Y-%m-%d")
+    today = datetime.today()
+    default_start = get_calendar().shift_sessions(today, -DEFAULT_LOOKBACK_SESSIONS).strftime("%Y-%m-%d")
+    default_end   = today.strftime("%Y-%m-%d")
 
     start_s = prompt_with_default("Start date", default_start)
     end_s   = prompt_with_default("End date", default_end)
@@ -136,22 +160,25 @@ def main():
 
     tickers = TICKERS
     start_dt, end_dt = prompt_dates()
-    end_plus_one = end_dt + timedelta(days=1)
+    yf_start, yf_end = yf_range(start_dt, end_dt)
+    prof = StageProfiler("asx_eod_downloader_2")
 
     print(f"\nDownloading EOD for {', '.join(tickers)} "
           f"from {start_dt.date()} to {end_dt.date()} ...")
 
     try:
-        raw = yf.download(
-            tickers,
-            start=start_dt.strftime("%Y-%m-%d"),
-            end=end_plus_one.strftime("%Y-%m-%d"),
-            interval="1d",
-            group_by="ticker",
-            auto_adjust=False,
-            threads=False,
-            progress=False
-        )
+        with prof.stage("download") as st:
+            raw = yf.download(
+                tickers,
+                start=yf_start,
+                end=yf_end,
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=False,
+                threads=False,
+                progress=False
+            )
+            st.rows = 0 if raw is None else len(raw)
     except Exception as e:
         print(f"Download failed: {e}")
         sys.exit(3)
@@ -160,45 +187,40 @@ def main():
         print("No data returned. Check tickers or date range.")
         sys.exit(4)
 
-    df = normalize_yf_panel(raw, tickers)
+    with prof.stage("normalize") as st:
+        df = normalize_yf_panel(raw, tickers)
+        st.rows = len(df)
     if df.empty:
         print("No valid data found for selected tickers.")
         sys.exit(5)
 
-    # ---- Attach Shares ----
-    df["Shares"] = df["Ticker"].map(SHARES_MAP).astype("Int64")
-
-    # ---- Compute Value = Shares × Close ----
-    close_numeric = pd.to_numeric(df["Close"], errors="coerce")
-    df["Value"] = (df["Shares"].astype("float64") * close_numeric).round(2)
-    # Convert to string with 2dp and zero padding
-    df["Value"] = df["Value"].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "")
-
-    # ---- Round and format price data (3 dp padded) ----
-    price_cols = ["Open", "High", "Low", "Close"]
-    for c in price_cols:
-        df[c] = pd.to_numeric(df[c], errors="coerce").round(3)
-        df[c] = df[c].apply(lambda x: f"{x:.3f}" if pd.notna(x) else "")
-
-    # ---- Ensure Volume is numeric ----
-    df["Volume"] = pd.to_numeric(df["Volume"], errors="coerce").astype("Int64")
-
-    # ---- Reorder columns ----
-    base_order = ["Date", "Ticker", "Shares", "Open", "High", "Low", "Close", "Volume", "Value"]
-    existing = [c for c in base_order if c in df.columns]
-    extras = [c for c in df.columns if c not in existing]
-    df = df[existing + extras].sort_values(["Date", "Ticker"]).reset_index(drop=True)
+    with prof.stage("format_eod", rows=len(df)):
+        df = format_eod(df)
 
     # ---- Save ----
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     out_path = os.path.join(OUTPUT_DIR, OUTPUT_CSV)
-    df.to_csv(out_path, index=False)
+    with prof.stage("to_csv", rows=len(df)):
+        df.to_csv(out_path, index=False)
     print(f"\nSaved consolidated CSV: {out_path}")
 
     # ---- Summary ----
     by_ticker = df.groupby("Ticker")["Date"].agg(["min", "max", "count"]).reset_index()
     print("\nSummary:")
     print(by_ticker.to_string(index=False))
+
+    # ---- Calendar gaps (sessions with no bar) ----
+    with prof.stage("calendar_gaps", rows=len(df)):
+        cal = get_calendar()
+        missing = cal.missing_sessions(df, start_dt, end_dt, tickers=tickers, value_col="Close")
+    if missing.empty:
+        print("\nNo missing sessions.")
+    else:
+        print("\nMissing sessions:")
+        for t, a, b in cal.missing_ranges(missing):
+            print(f"  - {t}: {a.date()} .. {b.date()}")
+
+    prof.finish()
     print("\nDone.")
 
 
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ASX intraday downloader (Yahoo Finance, yfinance)
+
+Version: 1m / 5m bars for the holdings in asx_eod_downloader_2.py,
+          stored as per-ticker, per-day compressed column chunks.
+
+Features:
+1) Same download/normalize path as the EOD downloader, interval 1m or 5m.
+2) One chunk file per ticker per session:
+     asx_intraday/<TICKER>/<interval>/<YYYY-MM-DD>.bin
+   Re-running a day merges into that day's chunk only; nothing else is rewritten.
+3) Columns stored separately and zlib-compressed; timestamps are
+   delta-encoded (first UTC second in the header, then int32 gaps).
+4) Time-window queries memory-map only the chunk files for the sessions
+   inside the window (sessions come from asx_calendar.py).
+5) Intraday bars roll up into the DailyData schema
+   (Date, Ticker, Shares, Open, High, Low, Close, Volume, Value).
+
+Yahoo only serves recent intraday history: 1m bars at most 7 days per
+request and 30 days back, 5m bars at most 60 days back. Ranges outside
+those limits are rejected before downloading.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# ---- Dependencies ----
+try:
+    import numpy as np
+    import pandas as pd
+    import yfinance as yf
+except ImportError:
+    print("Missing dependencies. Please run:\n  pip install yfinance pandas numpy")
+    sys.exit(1)
+
+from asx_calendar import get_calendar, parse_date_any, yf_range
+from asx_eod_downloader_2 import (OUTPUT_DIR, TICKERS, TICKERS_AND_SHARES,
+                                  format_eod, normalize_yf_panel,
+                                  prompt_with_default)
+
+os.environ["YF_NO_CACHE"] = "1"
+
+# ---- User settings ----
+INTRADAY_DIR = "asx_intraday"
+ROLLUP_CSV = "IntradayDaily.csv"
+EXCHANGE_TZ = "Australia/Sydney"
+DEFAULT_INTERVAL = "5m"
+
+# Yahoo limits per interval: max calendar days per request, max days back from today
+INTERVAL_MAX_SPAN_DAYS: Dict[str, int] = {"1m": 7, "5m": 60}
+INTERVAL_MAX_HISTORY_DAYS: Dict[str, int] = {"1m": 30, "5m": 60}
+
+CHUNK_MAGIC = b"AXI1"
+CHUNK_COLUMNS = [
+    # name, on-disk dtype
+    ("Open", "<f8"),
+    ("High", "<f8"),
+    ("Low", "<f8"),
+    ("Close", "<f8"),
+    ("Volume", "<i8"),
+]
+BAR_COLUMNS = ["Ticker", "Datetime"] + [c for c, _ in CHUNK_COLUMNS]
+
+
+# ---------- Chunk storage ----------
+
+def chunk_path(root: str, ticker: str, interval: str, day: str) -> str:
+    return os.path.join(root, ticker.replace(".", "_"), interval, f"{day}.bin")
+
+
+def _encode_times(ts: np.ndarray) -> (int, bytes):
+    """UTC epoch seconds -> (first second, zlib'd int32 deltas)."""
+    deltas = np.diff(ts).astype("<i4")
+    return int(ts[0]), zlib.compress(deltas.tobytes(), 6)
+
+
+def _decode_times(ts0: int, blob, rows: int) -> np.ndarray:
+    ts = np.empty(rows, dtype=np.int64)
+    ts[0] = ts0
+    if rows > 1:
+        deltas = np.frombuffer(zlib.decompress(blob), dtype="<i4")
+        ts[1:] = ts0 + np.cumsum(deltas, dtype=np.int64)
+    return ts
+
+
+def write_chunk(path: str, bars: pd.DataFrame) -> int:
+    """
+    Write one ticker-day of bars (Datetime as UTC epoch seconds + OHLCV).
+    Layout: magic, uint32 header length, JSON header, then column blobs.
+    Later rows win on duplicate timestamps, so callers append new bars last.
+    """
+    bars = bars.drop_duplicates("Datetime", keep="last").sort_values("Datetime", kind="stable")
+    ts = bars["Datetime"].to_numpy(dtype=np.int64)
+    ts0, ts_blob = _encode_times(ts)
+
+    blobs = [ts_blob]
+    cols = [{"name": "Datetime", "dtype": "delta<i4", "length": len(ts_blob)}]
+    for name, dtype in CHUNK_COLUMNS:
+        fill = np.nan if dtype.startswith("<f") else 0
+        arr = pd.to_numeric(bars[name], errors="coerce").fillna(fill).to_numpy(dtype=dtype)
+        blob = zlib.compress(arr.tobytes(), 6)
+        blobs.append(blob)
+        cols.append({"name": name, "dtype": dtype, "length": len(blob)})
+
+    header = json.dumps({"rows": len(ts), "ts0": ts0, "columns": cols}).encode("utf-8")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(CHUNK_MAGIC)
+        fh.write(struct.pack("<I", len(header)))
+        fh.write(header)
+        for blob in blobs:
+            fh.write(blob)
+    os.replace(tmp, path)
+    return len(ts)
+
+
+def read_chunk(path: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """Memory-map a chunk file and decode the requested columns (default: all)."""
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] != CHUNK_MAGIC:
+            raise ValueError(f"Not an intraday chunk: {path}")
+        (hlen,) = struct.unpack_from("<I", mm, 4)
+        header = json.loads(mm[8:8 + hlen].decode("utf-8"))
+        rows = header["rows"]
+
+        out: Dict[str, np.ndarray] = {}
+        pos = 8 + hlen
+        for col in header["columns"]:
+            name, length = col["name"], col["length"]
+            if columns is None or name in columns or name == "Datetime":
+                blob = mm[pos:pos + length]
+                if name == "Datetime":
+                    out[name] = _decode_times(header["ts0"], blob, rows)
+                else:
+                    out[name] = np.frombuffer(zlib.decompress(blob), dtype=col["dtype"])
+            pos += length
+    return out
+
+
+def store_bars(df: pd.DataFrame, interval: str, root: str = INTRADAY_DIR) -> pd.DataFrame:
+    """
+    Split long-form bars (Ticker, Date[local naive], OHLCV) into per-ticker,
+    per-day chunks, merging with any chunk already on disk for that day.
+    Empty bars (no OHLC at all) are dropped: normalize_yf_panel pads every
+    ticker to the union index, so illiquid holdings carry mostly-NaN rows.
+    Returns a summary: Ticker, Day, Bars.
+    """
+    df = df.dropna(subset=["Date"])
+    df = df.dropna(subset=["Open", "High", "Low", "Close"], how="all").copy()
+    local = pd.to_datetime(df["Date"]).dt.tz_localize(EXCHANGE_TZ)
+    df["Datetime"] = (local - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    df["Day"] = local.dt.strftime("%Y-%m-%d")
+
+    summary = []
+    for (t, day), grp in df.groupby(["Ticker", "Day"], sort=True):
+        path = chunk_path(root, t, interval, day)
+        bars = grp[["Datetime"] + [c for c, _ in CHUNK_COLUMNS]]
+        if os.path.exists(path):
+            old = pd.DataFrame(read_chunk(path))
+            bars = pd.concat([old, bars], ignore_index=True)
+        summary.append({"Ticker": t, "Day": day, "Bars": write_chunk(path, bars)})
+    return pd.DataFrame(summary, columns=["Ticker", "Day", "Bars"])
+
+
+def query_bars(tickers: List[str], start: datetime, end: datetime,
+               interval: str = DEFAULT_INTERVAL, root: str = INTRADAY_DIR,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Bars with start <= Datetime <= end (exchange local time, naive).
+    Only chunks for trading sessions inside the window are opened.
+    """
+    cal = get_calendar()
+    days = [str(d) for d in cal.sessions_between(start, end)]
+    lo = int(pd.Timestamp(start).tz_localize(EXCHANGE_TZ).timestamp())
+    hi = int(pd.Timestamp(end).tz_localize(EXCHANGE_TZ).timestamp())
+
+    frames = []
+    for t in tickers:
+        for day in days:
+            path = chunk_path(root, t, interval, day)
+            if not os.path.exists(path):
+                continue
+            cols = read_chunk(path, columns)
+            ts = cols["Datetime"]
+            i, j = np.searchsorted(ts, lo, side="left"), np.searchsorted(ts, hi, side="right")
+            if i == j:
+                continue
+            part = pd.DataFrame({k: v[i:j] for k, v in cols.items()})
+            part.insert(0, "Ticker", t)
+            frames.append(part)
+
+    if not frames:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+
+    out = pd.concat(frames, ignore_index=True)
+    out["Datetime"] = (pd.to_datetime(out["Datetime"], unit="s", utc=True)
+                         .dt.tz_convert(EXCHANGE_TZ).dt.tz_localize(None))
+    return out
+
+
+def rollup_eod(bars: pd.DataFrame) -> pd.DataFrame:
+    """Intraday bars -> one OHLCV row per ticker per session (long form, like normalize_yf_panel)."""
+    if bars.empty:
+        return pd.DataFrame(columns=["Ticker", "Date", "Open", "High", "Low", "Close", "Volume"])
+    bars = bars.sort_values(["Ticker", "Datetime"])
+    grp = bars.groupby(["Ticker", bars["Datetime"].dt.normalize().rename("Date")], sort=True)
+    out = grp.agg(Open=("Open", "first"), High=("High", "max"), Low=("Low", "min"),
+                  Close=("Close", "last"), Volume=("Volume", "sum"))
+    return out.reset_index()
+
+
+# ---------- Prompts ----------
+
+def prompt_interval() -> str:
+    interval = prompt_with_default("Interval (1m/5m)", DEFAULT_INTERVAL)
+    if interval not in INTERVAL_MAX_SPAN_DAYS:
+        print("Invalid interval. Use 1m or 5m.")
+        sys.exit(2)
+    return interval
+
+
+def prompt_dates(interval: str) -> (datetime, datetime):
+    print("\n=== ASX Intraday Downloader ===")
+    print("Using hard-coded holdings:")
+    for sym, sh in TICKERS_AND_SHARES:
+        print(f"  - {sym}: {sh} shares")
+
+    # Default: the widest session-aligned window Yahoo serves in one request,
+    # bounded by both the per-request span and the history limit (from today)
+    cal = get_calendar()
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    span = INTERVAL_MAX_SPAN_DAYS[interval]
+    history = INTERVAL_MAX_HISTORY_DAYS[interval]
+    last = cal.shift_sessions(today, 0)
+    earliest = max(last - timedelta(days=span - 1), today - timedelta(days=history - 1))
+    first = cal.sessions[cal.session_ceil(earliest)]
+    default_start = pd.Timestamp(first).strftime("%Y-%m-%d")
+    default_end   = last.strftime("%Y-%m-%d")
+
+    start_s = prompt_with_default("Start date", default_start)
+    end_s   = prompt_with_default("End date", default_end)
+
+    start_dt = parse_date_any(start_s)
+    end_dt   = parse_date_any(end_s)
+
+    if not start_dt or not end_dt:
+        print("Invalid date(s). Use formats like 2025-10-25 or 25/10/2025.")
+        sys.exit(2)
+    if end_dt < start_dt:
+        print("End date cannot precede start date.")
+        sys.exit(2)
+    if (end_dt - start_dt).days + 1 > span:
+        print(f"Range too long for {interval} bars: Yahoo serves at most {span} days per request.")
+        sys.exit(2)
+    if (today - start_dt).days >= history:
+        print(f"Start date too old for {interval} bars: Yahoo keeps only the last {history} days.")
+        sys.exit(2)
+    return start_dt, end_dt
+
+
+# ---------- Main ----------
+
+def main():
+    if not TICKERS_AND_SHARES:
+        print("No holdings defined. Please populate TICKERS_AND_SHARES.")
+        sys.exit(2)
+
+    tickers = TICKERS
+    interval = prompt_interval()
+    start_dt, end_dt = prompt_dates(interval)
+    yf_start, yf_end = yf_range(start_dt, end_dt)
+
+    print(f"\nDownloading {interval} bars for {', '.join(tickers)} "
+          f"from {start_dt.date()} to {end_dt.date()} ...")
+
+    try:
+        raw = yf.download(
+            tickers,
+            start=yf_start,
+            end=yf_end,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=False,
+            prepost=False,
+            threads=False,
+            progress=False
+        )
+    except Exception as e:
+        print(f"Download failed: {e}")
+        sys.exit(3)
+
+    if raw is None or (isinstance(raw, pd.DataFrame) and raw.empty):
+        print("No data returned. Check tickers, interval limits or date range.")
+        sys.exit(4)
+
+    df = normalize_yf_panel(raw, tickers)
+    if df.empty:
+        print("No valid data found for selected tickers.")
+        sys.exit(5)
+
+    # ---- Store per-ticker, per-day chunks ----
+    stored = store_bars(df, interval)
+    print(f"\nStored {int(stored['Bars'].sum())} bars in {len(stored)} chunks under {INTRADAY_DIR}/")
+
+    # ---- Roll up stored window into DailyData schema ----
+    window_end = end_dt.replace(hour=23, minute=59, second=59)
+    bars = query_bars(tickers, start_dt, window_end, interval)
+    eod = format_eod(rollup_eod(bars))
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    out_path = os.path.join(OUTPUT_DIR, ROLLUP_CSV)
+    eod.to_csv(out_path, index=False)
+    print(f"Saved intraday roll-up CSV: {out_path}")
+
+    # ---- Summary ----
+    by_ticker = stored.groupby("Ticker").agg(days=("Day", "count"), bars=("Bars", "sum")).reset_index()
+    print("\nSummary:")
+    print(by_ticker.to_string(index=False))
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-stage profiler for the downloader / converter scripts
+
+Version: Off unless the PROFILE environment variable is set.
+
+    PROFILE=1         time each named stage, print a table, append a JSON report
+    PROFILE=mem       also record peak tracemalloc bytes per stage
+    PROFILE=cprofile  also dump a cProfile .prof file for the whole run
+                      (open with snakeviz, or flameprof/gprof2dot for flamegraphs)
+    PROFILE=mem,cprofile  both
+
+tracemalloc and cProfile each slow Python-heavy stages several times over,
+so only PROFILE=1 timings are comparable run to run. The report records
+which tracers were on.
+
+Features:
+1) Per stage: wall time, CPU time, rows processed (+ peak bytes with mem).
+2) One JSON line per run appended to profile_reports/<script>.jsonl,
+   so hot-path regressions can be tracked over time.
+3) The report is also written when the script exits early (sys.exit or
+   an exception), via atexit.
+4) Disabled profiler costs one attribute check per stage.
+
+Usage:
+    prof = StageProfiler("asx_eod_downloader_2")
+    with prof.stage("download") as st:
+        raw = yf.download(...)
+        st.rows = len(raw)
+    prof.finish()
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# ---- Settings ----
+PROFILE_ENV = "PROFILE"
+REPORT_DIR = os.environ.get("PROFILE_DIR", "profile_reports")
+
+
+class StageRecord:
+    """Mutable per-stage slot; the caller sets `rows` inside the with-block."""
+
+    __slots__ = ("name", "rows", "wall_s", "cpu_s", "peak_bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: Optional[int] = None
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_bytes: Optional[int] = None
+
+    def as_dict(self) -> Dict:
+        return {"stage": self.name, "rows": self.rows, "wall_s": round(self.wall_s, 6),
+                "cpu_s": round(self.cpu_s, 6), "peak_bytes": self.peak_bytes}
+
+
+class StageProfiler:
+    def __init__(self, script: str, mode: Optional[str] = None):
+        mode = (os.environ.get(PROFILE_ENV, "") if mode is None else mode).strip().lower()
+        opts = {m.strip() for m in mode.split(",")} - {""}
+        self.script = script
+        self.enabled = bool(opts) and not opts & {"0", "off", "false", "no"}
+        self.use_tracemalloc = self.enabled and "mem" in opts
+        self.use_cprofile = self.enabled and "cprofile" in opts
+        self.stages: List[StageRecord] = []
+        self._profiler: Optional[cProfile.Profile] = None
+        self._finished = False
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+
+        if self.enabled:
+            atexit.register(self.finish)
+            if self.use_tracemalloc:
+                tracemalloc.start()
+            if self.use_cprofile:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        rec = StageRecord(name)
+        rec.rows = rows
+        if not self.enabled:
+            yield rec
+            return
+
+        if self.use_tracemalloc:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield rec
+        finally:
+            rec.wall_s = time.perf_counter() - w0
+            rec.cpu_s = time.process_time() - c0
+            if self.use_tracemalloc:
+                rec.peak_bytes = max(tracemalloc.get_traced_memory()[1] - base, 0)
+            self.stages.append(rec)
+
+    def finish(self) -> Optional[str]:
+        """Stop profiling, print the stage table, write reports. Returns the JSON path."""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+
+        total_wall = time.perf_counter() - self._t0
+        total_cpu = time.process_time() - self._c0
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(REPORT_DIR, exist_ok=True)
+
+        prof_path = None
+        if self._profiler is not None:
+            self._profiler.disable()
+            prof_path = os.path.join(REPORT_DIR, f"{self.script}_{stamp}.prof")
+            self._profiler.dump_stats(prof_path)
+        if self.use_tracemalloc:
+            tracemalloc.stop()
+
+        report = {
+            "script": self.script,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "total_wall_s": round(total_wall, 6),
+            "total_cpu_s": round(total_cpu, 6),
+            "tracemalloc": self.use_tracemalloc,
+            "cprofile": self.use_cprofile,
+            "stages": [s.as_dict() for s in self.stages],
+            "cprofile_file": prof_path,
+        }
+        json_path = os.path.join(REPORT_DIR, f"{self.script}.jsonl")
+        with open(json_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(report) + "\n")
+
+        self.print_table(total_wall, total_cpu)
+        print(f"Profile report appended: {json_path}")
+        if prof_path:
+            print(f"cProfile stats: {prof_path}")
+        return json_path
+
+    def print_table(self, total_wall: float, total_cpu: float):
+        print(f"\nProfile ({self.script}):")
+        print(f"  {'stage':<16} {'wall s':>9} {'cpu s':>9} {'rows':>9} {'peak MiB':>9}")
+        for s in self.stages:
+            rows = "" if s.rows is None else str(s.rows)
+            peak = "" if s.peak_bytes is None else f"{s.peak_bytes / 2**20:.2f}"
+            print(f"  {s.name:<16} {s.wall_s:>9.3f} {s.cpu_s:>9.3f} {rows:>9} {peak:>9}")
+        print(f"  {'total':<16} {total_wall:>9.3f} {total_cpu:>9.3f}")